@@ -1,6 +1,7 @@
 """F1 API handling and response processing"""
 
-from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, Optional, List
 import httpx
 import pandas as pd
 from datetime import datetime
@@ -114,13 +115,23 @@ class F1ResponseProcessor:
         
         return pd.DataFrame(results)
 
+@asynccontextmanager
+async def _use_client(client: Optional[httpx.AsyncClient]) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the caller's pooled client, or a short-lived one closed on exit"""
+    if client is not None:
+        yield client
+    else:
+        async with httpx.AsyncClient() as owned_client:
+            yield owned_client
+
 @sleep_and_retry
 @limits(calls=CALLS_PER_SECOND, period=1)
-async def fetch_f1_data(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def fetch_f1_data(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                        client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
     """Fetch data from F1 API with automatic response processing"""
     try:
         url = f"{ERGAST_BASE_URL}{endpoint}.json"
-        async with httpx.AsyncClient() as client:
+        async with _use_client(client) as client:
             response = await client.get(url, params=params, timeout=10.0)
             response.raise_for_status()
             
@@ -187,6 +198,18 @@ async def fetch_f1_data(endpoint: str, params: Optional[Dict[str, Any]] = None)
                     }
                 }
                 
+    except httpx.HTTPStatusError as e:
+        return {
+            'success': False,
+            'error': f'Request failed: {str(e)}',
+            'metadata': {
+                'url': url,
+                'params': params,
+                'timestamp': datetime.now().isoformat(),
+                'error_type': type(e).__name__,
+                'status_code': e.response.status_code
+            }
+        }
     except httpx.RequestError as e:
         return {
             'success': False,
@@ -1,4 +1,5 @@
 """Main application integrating F1 data pipeline with analysis"""
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
@@ -8,6 +9,7 @@ import ast
 
 # FastAPI and Pydantic
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -18,7 +20,7 @@ from sqlalchemy.orm import Session
 
 # Custom components
 from app.query.processor import QueryProcessor
-from app.pipeline.data2 import DataPipeline
+from app.pipeline.data2 import DataPipeline, aclose_http_clients
 from app.pipeline.optimized_adapters import OptimizedQueryAdapter, OptimizedResultAdapter
 from app.analyst.generate import generate_code, execute_code_safely
 
@@ -26,7 +28,13 @@ from app.analyst.generate import generate_code, execute_code_safely
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the pipeline's pooled HTTP clients on shutdown"""
+    yield
+    await aclose_http_clients()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
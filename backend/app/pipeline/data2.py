@@ -1,21 +1,165 @@
 """Enhanced Data Pipeline with support for historical and complex queries"""
 
 import asyncio
-from typing import Dict, Any, List, Optional, Union, cast
+import random
+import re
+import sys
+import time
+import weakref
+from typing import Dict, Any, List, Optional, Tuple, Union
+import httpx
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from enum import Enum
 from ..query.models import DataRequirements, ProcessingResult
 from ..api.f1_api import fetch_f1_data
 from ..api.f1_endpoints import build_endpoint
 
-@dataclass
+# Shared HTTP client per event loop, pooling connections and capping in-flight fetches
+_MAX_CONCURRENT_FETCHES = 8
+_FETCH_TIMEOUT = 15.0  # seconds per network call, excluding time queued for a slot
+_http_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _get_http_state() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    """Return the pooled client and fetch semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    state = _http_state.get(loop)
+    if state is None or state[0].is_closed:
+        client = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=_MAX_CONCURRENT_FETCHES,
+            max_keepalive_connections=_MAX_CONCURRENT_FETCHES,
+            keepalive_expiry=300
+        ))
+        state = (client, asyncio.Semaphore(_MAX_CONCURRENT_FETCHES))
+        _http_state[loop] = state
+    return state
+
+async def aclose_http_clients() -> None:
+    """Close every pooled client and forget them; call at application shutdown"""
+    states = list(_http_state.values())
+    _http_state.clear()
+    for client, _ in states:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # A client created on an already-closed loop can't shut down cleanly
+            print(f"Error closing HTTP client: {str(e)}")
+
+def _ts() -> float:
+    """Response timestamp as Unix epoch seconds; formatting is left to the API layer"""
+    return time.time()
+
+# Query classification patterns, compiled once at import
+_HISTORICAL_RE = re.compile(r'since|from|decade|between')
+_CAREER_RE = re.compile(r'career|all time|lifetime|overall')
+
+# Driver ids use underscores in place of spaces (e.g. 'max_verstappen')
+_DRIVER_TABLE = str.maketrans({' ': '_'})
+
+def _norm_driver(value: Any) -> Any:
+    """Normalize a driver name to its API id form"""
+    return value.translate(_DRIVER_TABLE).lower() if isinstance(value, str) else value
+
+def _norm_text(value: Any) -> Any:
+    """Strip surrounding whitespace from string values"""
+    return value.strip() if isinstance(value, str) else value
+
+def _norm_value(key: str, value: Any) -> Any:
+    """Normalize a single parameter value or list of values"""
+    norm = _norm_driver if key == 'driver' else _norm_text
+    if isinstance(value, list):
+        return [norm(v) for v in value]
+    return norm(value)
+
+def _freeze_params(params: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Convert params into sorted items with lists frozen to tuples"""
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()))
+
+# Slotted dataclasses need Python 3.10+; fall back to regular ones on older runtimes
+_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
+class ResponseMetadata:
+    """Metadata attached to a pipeline response"""
+    timestamp: float  # Unix epoch seconds
+    endpoint: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    attempt: Optional[int] = None
+    rows: Optional[int] = None
+    error_type: Optional[str] = None
+    max_retries: Optional[int] = None
+    status_code: Optional[int] = None
+    query_type: Optional[str] = None
+    years_processed: Optional[int] = None
+    metrics_processed: Optional[int] = None
+    entity_type: Optional[str] = None
+    entities: Optional[List[Any]] = None
+    batch_size: Optional[int] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a metadata dict, omitting unset fields"""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+@dataclass(frozen=True, **_SLOTS)
 class DataResponse:
     """Response from data pipeline"""
     success: bool
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[ResponseMetadata] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict shape returned by DataPipeline.process"""
+        return {
+            'success': self.success,
+            'data': self.data,
+            'error': self.error,
+            'metadata': self.metadata.to_dict() if self.metadata else {}
+        }
+
+def _backoff_delay(base_delay: float, attempt: int, cap: float = 8.0) -> float:
+    """Exponential backoff capped at `cap` seconds, with jitter to spread out retries"""
+    return min(base_delay * (2 ** attempt), cap) * (0.5 + random.random() * 0.5)
+
+def _is_client_error(status_code: Optional[int]) -> bool:
+    """4xx responses won't succeed on retry, except 429 rate limiting"""
+    return status_code is not None and 400 <= status_code < 500 and status_code != 429
+
+def _concat_with_key(frames: List[pd.DataFrame], keys: List[Any], name: str) -> pd.DataFrame:
+    """Stack frames and record each frame's key in a `name` column"""
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].assign(**{name: keys[0]}).reset_index(drop=True)
+    
+    # Annotate once after stacking; an existing column of the same name is replaced
+    merged = pd.concat(frames, ignore_index=True, copy=False)
+    merged[name] = np.repeat(np.asarray(keys), [len(f) for f in frames])
+    return merged
+
+async def _iter_completed(coros: List[Any]):
+    """Yield (index, result) pairs in completion order, capturing exceptions"""
+    async def run(index: int, coro: Any):
+        try:
+            return index, await coro
+        except Exception as e:
+            return index, e
+    
+    for fut in asyncio.as_completed([run(i, coro) for i, coro in enumerate(coros)]):
+        yield await fut
+
+class QueryType(Enum):
+    """Processing strategy selected for a set of requirements"""
+    HISTORICAL = 'historical'
+    CAREER = 'career'
+    PARALLEL = 'parallel'
+    SINGLE = 'single'
 
 class DataRequirementsSplitter:
     """Splits complex requirements into atomic fetchable units"""
@@ -49,12 +193,13 @@ class DataRequirementsSplitter:
         if not start_year:
             start_year = end_year - 5  # Default to last 5 years
             
-        # Create year-by-year requirements
-        base_params = {k: v for k, v in params.items() if k not in ['year', 'season']}
+        # Create year-by-year requirements from a shared template, copied once per year
+        base_params = {k: v for k, v in params.items() if k not in ('year', 'season')}
         for year in range(start_year, end_year + 1):
+            base_params['year'] = str(year)
             split_reqs.append({
                 'endpoint': requirements.endpoint,
-                'params': {**base_params, 'year': str(year)},
+                'params': base_params.copy(),
                 'metadata': {'year': year}
             })
         
@@ -87,44 +232,64 @@ class DataRequirementsSplitter:
 class DataPipeline:
     """Enhanced pipeline for processing F1 data requests"""
     
+    # Response cache shared across instances, since callers build a pipeline per request
+    _cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+    # asyncio.Lock binds to one event loop, so per-key locks are held per loop as [lock, users]
+    _cache_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, List[Any]]]" = weakref.WeakKeyDictionary()
+    _cache_max_size = 1024
+    _cache_ttl = 3600.0  # seconds; completed seasons never expire
+    
     async def process(self, requirements: Any) -> Dict[str, Any]:
         """Process data requirements with support for complex queries"""
+        return (await self._dispatch(requirements)).to_dict()
+    
+    async def _dispatch(self, requirements: Any) -> DataResponse:
+        """Route requirements to the matching processing strategy"""
         try:
-            # Check if this is a complex query requiring multiple fetches
-            if self._is_historical_query(requirements):
+            query_type = self._classify(requirements)
+            if query_type is QueryType.HISTORICAL:
                 return await self._process_historical(requirements)
-            elif self._is_career_query(requirements):
+            elif query_type is QueryType.CAREER:
                 return await self._process_career(requirements)
-            elif self._is_multi_entity_query(requirements):
+            elif query_type is QueryType.PARALLEL:
                 return await self._process_parallel(requirements)
             else:
                 return await self._process_single(requirements)
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'data': None,
-                'metadata': {
-                    'timestamp': datetime.now().isoformat(),
-                    'error_type': type(e).__name__
-                }
-            }
+            return DataResponse(
+                success=False,
+                error=str(e),
+                metadata=ResponseMetadata(
+                    timestamp=_ts(),
+                    error_type=type(e).__name__
+                )
+            )
+    
+    def _classify(self, requirements: Any) -> QueryType:
+        """Pick a processing strategy, checking complex query types first"""
+        if self._is_historical_query(requirements):
+            return QueryType.HISTORICAL
+        if self._is_career_query(requirements):
+            return QueryType.CAREER
+        if self._is_multi_entity_query(requirements):
+            return QueryType.PARALLEL
+        return QueryType.SINGLE
     
     def _is_historical_query(self, requirements: Any) -> bool:
         """Check if query requires historical data processing"""
         params = requirements.params
-        if isinstance(params.get('year'), list) and len(params['year']) > 1:
-            return True
+        year_val = params.get('year')
+        if isinstance(year_val, list):
+            return len(year_val) > 1
         if isinstance(params.get('season'), list) and len(params['season']) > 1:  # Backward compatibility
             return True
-        year_str = str(params.get('year', ''))
-        return any(term in year_str.lower() for term in ['since', 'from', 'decade', 'between'])
+        # Only a scalar year string can carry a range term, so skip the scan otherwise
+        return isinstance(year_val, str) and bool(_HISTORICAL_RE.search(year_val.lower()))
     
     def _is_career_query(self, requirements: Any) -> bool:
         """Check if query requires career-wide data processing"""
-        params = requirements.params
-        query_str = str(params.get('query', '')).lower()
-        return any(term in query_str for term in ['career', 'all time', 'lifetime', 'overall'])
+        query_str = requirements.params.get('query')
+        return isinstance(query_str, str) and bool(_CAREER_RE.search(query_str.lower()))
     
     def _is_multi_entity_query(self, requirements: Any) -> bool:
         """Check if query involves multiple entities"""
@@ -132,7 +297,7 @@ class DataPipeline:
         return (isinstance(params.get('driver'), list) or 
                 isinstance(params.get('constructor'), list))
     
-    async def _process_historical(self, requirements: Any) -> Dict[str, Any]:
+    async def _process_historical(self, requirements: Any) -> DataResponse:
         """Process historical query with year-by-year data"""
         split_reqs = DataRequirementsSplitter.split_historical(requirements)
         
@@ -145,46 +310,42 @@ class DataPipeline:
             )
             tasks.append(self._process_single(single_req))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Merge results with year tracking
+        # Merge results with year tracking as each year completes
         success = True
-        merged_data = {'results': pd.DataFrame()}
-        errors = []
+        frames: List[Optional[pd.DataFrame]] = [None] * len(tasks)
+        errors: List[Optional[str]] = [None] * len(tasks)
         
-        for i, result in enumerate(results):
+        async for i, result in _iter_completed(tasks):
             if isinstance(result, Exception):
                 success = False
-                errors.append(f"Error processing year {split_reqs[i]['metadata']['year']}: {str(result)}")
+                errors[i] = f"Error processing year {split_reqs[i]['metadata']['year']}: {str(result)}"
                 continue
             
-            result_dict = cast(Dict[str, Any], result)
-            if not result_dict.get('success', False):
+            if not result.success:
                 success = False
-                errors.append(f"Failed to process year {split_reqs[i]['metadata']['year']}: {result_dict.get('error', 'Unknown error')}")
+                errors[i] = f"Failed to process year {split_reqs[i]['metadata']['year']}: {result.error or 'Unknown error'}"
             else:
-                result_data = result_dict.get('data', {})
-                if isinstance(result_data, dict):
-                    df = result_data.get('results', pd.DataFrame())
-                    if not df.empty:
-                        df['year'] = split_reqs[i]['metadata']['year']
-                        if merged_data['results'].empty:
-                            merged_data['results'] = df
-                        else:
-                            merged_data['results'] = pd.concat([merged_data['results'], df], ignore_index=True)
+                df = result.data['results']
+                if not df.empty:
+                    frames[i] = df
         
-        return {
-            'success': success and not merged_data['results'].empty,
-            'data': merged_data if not merged_data['results'].empty else None,
-            'error': '; '.join(errors) if errors else None,
-            'metadata': {
-                'query_type': 'historical',
-                'years_processed': len(split_reqs),
-                'timestamp': datetime.now().isoformat()
-            }
-        }
+        # Concatenate once, then tag rows with their year in a single column assignment
+        years = [split_reqs[i]['metadata']['year'] for i, df in enumerate(frames) if df is not None]
+        frames = [df for df in frames if df is not None]
+        merged_df = _concat_with_key(frames, years, 'year')
+        
+        return DataResponse(
+            success=success and not merged_df.empty,
+            data={'results': merged_df} if not merged_df.empty else None,
+            error='; '.join(e for e in errors if e) or None,
+            metadata=ResponseMetadata(
+                query_type='historical',
+                years_processed=len(split_reqs),
+                timestamp=_ts()
+            )
+        )
     
-    async def _process_career(self, requirements: Any) -> Dict[str, Any]:
+    async def _process_career(self, requirements: Any) -> DataResponse:
         """Process career-wide query with multiple metrics"""
         split_reqs = DataRequirementsSplitter.split_career(requirements)
         
@@ -197,41 +358,42 @@ class DataPipeline:
             )
             tasks.append(self._process_single(single_req))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Merge results with metric tracking
+        # Merge results with metric tracking as each metric completes
         success = True
-        merged_data = {}
-        errors = []
+        metric_frames: List[Optional[pd.DataFrame]] = [None] * len(tasks)
+        errors: List[Optional[str]] = [None] * len(tasks)
         
-        for i, result in enumerate(results):
+        async for i, result in _iter_completed(tasks):
             metric = split_reqs[i]['metadata']['metric']
             if isinstance(result, Exception):
                 success = False
-                errors.append(f"Error processing {metric}: {str(result)}")
+                errors[i] = f"Error processing {metric}: {str(result)}"
                 continue
             
-            result_dict = cast(Dict[str, Any], result)
-            if not result_dict.get('success', False):
+            if not result.success:
                 success = False
-                errors.append(f"Failed to process {metric}: {result_dict.get('error', 'Unknown error')}")
+                errors[i] = f"Failed to process {metric}: {result.error or 'Unknown error'}"
             else:
-                result_data = result_dict.get('data', {})
-                if isinstance(result_data, dict):
-                    merged_data[metric] = result_data.get('results', pd.DataFrame())
+                metric_frames[i] = result.data['results']
         
-        return {
-            'success': success and any(not df.empty for df in merged_data.values()),
-            'data': {'results': merged_data} if merged_data else None,
-            'error': '; '.join(errors) if errors else None,
-            'metadata': {
-                'query_type': 'career',
-                'metrics_processed': len(split_reqs),
-                'timestamp': datetime.now().isoformat()
-            }
+        # Build in split order so output doesn't depend on completion order
+        merged_data = {
+            split_reqs[i]['metadata']['metric']: df
+            for i, df in enumerate(metric_frames) if df is not None
         }
+        
+        return DataResponse(
+            success=success and any(not df.empty for df in merged_data.values()),
+            data={'results': merged_data} if merged_data else None,
+            error='; '.join(e for e in errors if e) or None,
+            metadata=ResponseMetadata(
+                query_type='career',
+                metrics_processed=len(split_reqs),
+                timestamp=_ts()
+            )
+        )
     
-    async def _process_parallel(self, requirements: Any) -> Dict[str, Any]:
+    async def _process_parallel(self, requirements: Any) -> DataResponse:
         """Process multiple entities in parallel with batching"""
         params = requirements.params
         base_params = {k: v for k, v in params.items()}
@@ -250,236 +412,260 @@ class DataPipeline:
             del base_params['constructor']
         
         if not entities or not entity_type:
-            return {
-                'success': False,
-                'error': "No parallel entities found",
-                'data': None,
-                'metadata': {
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-        
-        # Process entities in batches
+            return DataResponse(
+                success=False,
+                error='No parallel entities found',
+                metadata=ResponseMetadata(timestamp=_ts())
+            )
+        
+        # Process entities concurrently, capped at batch_size in flight
         batch_size = 4
-        all_results = []
+        sem = asyncio.Semaphore(batch_size)
         
-        for i in range(0, len(entities), batch_size):
-            batch = entities[i:i + batch_size]
-            batch_tasks = []
-            
-            for entity in batch:
-                entity_params = base_params.copy()
-                entity_params[entity_type] = entity
-                single_req = type(requirements)(
-                    endpoint=requirements.endpoint,
-                    params=entity_params
-                )
-                batch_tasks.append(self._process_single(single_req))
-            
-            # Execute batch with retry logic
-            try:
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                all_results.extend(batch_results)
-            except Exception as e:
-                print(f"Error processing batch {i//batch_size + 1}: {str(e)}")
+        async def process_entity(entity: Any) -> DataResponse:
+            entity_params = {**base_params, entity_type: entity}
+            single_req = type(requirements)(
+                endpoint=requirements.endpoint,
+                params=entity_params
+            )
+            async with sem:
+                return await self._process_single(single_req)
         
-        # Merge results
+        tasks = [process_entity(entity) for entity in entities]
+        
+        # Merge results as each entity completes, keeping entity order deterministic
         success = True
-        merged_data = {'results': pd.DataFrame()}
-        errors = []
+        frames: List[Optional[pd.DataFrame]] = [None] * len(tasks)
+        errors: List[Optional[str]] = [None] * len(tasks)
         
-        for i, result in enumerate(all_results):
+        async for i, result in _iter_completed(tasks):
             if isinstance(result, Exception):
                 success = False
-                errors.append(f"Error processing {entities[i]}: {str(result)}")
+                errors[i] = f"Error processing {entities[i]}: {str(result)}"
                 continue
             
-            result_dict = cast(Dict[str, Any], result)
-            if not result_dict.get('success', False):
+            if not result.success:
                 success = False
-                errors.append(f"Failed to process {entities[i]}: {result_dict.get('error', 'Unknown error')}")
+                errors[i] = f"Failed to process {entities[i]}: {result.error or 'Unknown error'}"
             else:
-                result_data = result_dict.get('data', {})
-                if isinstance(result_data, dict):
-                    df = result_data.get('results', pd.DataFrame())
-                    if not df.empty:
-                        df[entity_type] = entities[i]
-                        if merged_data['results'].empty:
-                            merged_data['results'] = df
-                        else:
-                            merged_data['results'] = pd.concat([merged_data['results'], df], ignore_index=True)
+                df = result.data['results']
+                if not df.empty:
+                    frames[i] = df
         
-        return {
-            'success': success and not merged_data['results'].empty,
-            'data': merged_data if not merged_data['results'].empty else None,
-            'error': '; '.join(errors) if errors else None,
-            'metadata': {
-                'entity_type': entity_type,
-                'entities': entities,
-                'timestamp': datetime.now().isoformat(),
-                'batch_size': batch_size,
-                'total_batches': (len(entities) + batch_size - 1) // batch_size
-            }
-        }
+        # Concatenate once, then tag rows with their entity in a single column assignment
+        keys = [entities[i] for i, df in enumerate(frames) if df is not None]
+        frames = [df for df in frames if df is not None]
+        merged_df = _concat_with_key(frames, keys, entity_type)
+        
+        return DataResponse(
+            success=success and not merged_df.empty,
+            data={'results': merged_df} if not merged_df.empty else None,
+            error='; '.join(e for e in errors if e) or None,
+            metadata=ResponseMetadata(
+                entity_type=entity_type,
+                entities=entities,
+                timestamp=_ts(),
+                batch_size=batch_size
+            )
+        )
     
-    async def _process_single(self, requirements: Any) -> Dict[str, Any]:
+    async def _process_single(self, requirements: Any) -> DataResponse:
         """Process a single entity request with retries"""
         max_retries = 3
         retry_delay = 1.0  # seconds
+        timestamp = _ts()
         
         # Validate input parameters
         if not requirements or not hasattr(requirements, 'endpoint'):
-            return {
-                'success': False,
-                'error': 'Invalid requirements format',
-                'data': None,
-                'metadata': {'timestamp': datetime.now().isoformat()}
-            }
+            return DataResponse(
+                success=False,
+                error='Invalid requirements format',
+                metadata=ResponseMetadata(timestamp=timestamp)
+            )
 
         endpoint = requirements.endpoint
         params = self._normalize_params(requirements.params)
 
         # Validate endpoint and params
         if not endpoint or not params:
-            return {
-                'success': False,
-                'error': 'Missing required parameters',
-                'data': None,
-                'metadata': {'timestamp': datetime.now().isoformat()}
-            }
+            return DataResponse(
+                success=False,
+                error='Missing required parameters',
+                metadata=ResponseMetadata(timestamp=timestamp)
+            )
+        
+        # Build endpoint once; inputs are identical across retry attempts
+        try:
+            full_endpoint = build_endpoint(endpoint, **params)
+        except Exception as e:
+            return DataResponse(
+                success=False,
+                error=f'Processing error: {str(e)}',
+                metadata=ResponseMetadata(
+                    endpoint=endpoint,
+                    timestamp=timestamp,
+                    attempt=1,
+                    error_type=type(e).__name__
+                )
+            )
+        
+        if not full_endpoint:
+            return DataResponse(
+                success=False,
+                error='Failed to build endpoint',
+                metadata=ResponseMetadata(
+                    endpoint=endpoint,
+                    params=params,
+                    timestamp=timestamp
+                )
+            )
         
         for attempt in range(max_retries):
             try:
-                # Build endpoint and fetch data
-                full_endpoint = build_endpoint(endpoint, **params)
-                if not full_endpoint:
-                    return {
-                        'success': False,
-                        'error': 'Failed to build endpoint',
-                        'data': None,
-                        'metadata': {
-                            'endpoint': endpoint,
-                            'params': params,
-                            'timestamp': datetime.now().isoformat()
-                        }
-                    }
-
-                response = await fetch_f1_data(full_endpoint, params)
+                response = await self._cached_fetch(full_endpoint, params)
                 
                 # Handle dictionary response from fetch_f1_data
                 if not isinstance(response, dict):
-                    return {
-                        'success': False,
-                        'error': f'Invalid response type: {type(response)}',
-                        'data': None,
-                        'metadata': {
-                            'endpoint': full_endpoint,
-                            'params': params,
-                            'timestamp': datetime.now().isoformat(),
-                            'attempt': attempt + 1
-                        }
-                    }
+                    return DataResponse(
+                        success=False,
+                        error=f'Invalid response type: {type(response)}',
+                        metadata=ResponseMetadata(
+                            endpoint=full_endpoint,
+                            params=params,
+                            timestamp=timestamp,
+                            attempt=attempt + 1
+                        )
+                    )
 
                 success = response.get('success', False)
                 data = response.get('data')
                 error = response.get('error')
 
                 if success and isinstance(data, pd.DataFrame):
-                    return {
-                        'success': True,
-                        'data': {'results': data},
-                        'error': None,
-                        'metadata': {
-                            'endpoint': full_endpoint,
-                            'params': params,
-                            'timestamp': datetime.now().isoformat(),
-                            'attempt': attempt + 1,
-                            'rows': len(data)
-                        }
-                    }
+                    return DataResponse(
+                        success=True,
+                        data={'results': data},
+                        metadata=ResponseMetadata(
+                            endpoint=full_endpoint,
+                            params=params,
+                            timestamp=timestamp,
+                            attempt=attempt + 1,
+                            rows=len(data)
+                        )
+                    )
                 
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay * (attempt + 1))
+                # Client errors fail fast; server errors and empty results are retried
+                status_code = (response.get('metadata') or {}).get('status_code')
+                if not _is_client_error(status_code) and attempt < max_retries - 1:
+                    await asyncio.sleep(_backoff_delay(retry_delay, attempt))
                     continue
                 
-                return {
-                    'success': False,
-                    'error': error or 'No data retrieved',
-                    'data': None,
-                    'metadata': {
-                        'endpoint': full_endpoint,
-                        'params': params,
-                        'timestamp': datetime.now().isoformat(),
-                        'attempt': attempt + 1
-                    }
-                }
+                return DataResponse(
+                    success=False,
+                    error=error or 'No data retrieved',
+                    metadata=ResponseMetadata(
+                        endpoint=full_endpoint,
+                        params=params,
+                        timestamp=timestamp,
+                        attempt=attempt + 1,
+                        status_code=status_code
+                    )
+                )
                 
             except Exception as e:
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay * (attempt + 1))
+                    await asyncio.sleep(_backoff_delay(retry_delay, attempt))
                     continue
                 
-                return {
-                    'success': False,
-                    'error': f'Processing error: {str(e)}',
-                    'data': None,
-                    'metadata': {
-                        'endpoint': endpoint,
-                        'timestamp': datetime.now().isoformat(),
-                        'attempt': attempt + 1,
-                        'error_type': type(e).__name__
-                    }
-                }
+                return DataResponse(
+                    success=False,
+                    error=f'Processing error: {str(e)}',
+                    metadata=ResponseMetadata(
+                        endpoint=endpoint,
+                        timestamp=timestamp,
+                        attempt=attempt + 1,
+                        error_type=type(e).__name__
+                    )
+                )
         
-        return {
-            'success': False,
-            'error': 'Max retries exceeded',
-            'data': None,
-            'metadata': {
-                'endpoint': endpoint,
-                'timestamp': datetime.now().isoformat(),
-                'max_retries': max_retries
-            }
-        }
+        return DataResponse(
+            success=False,
+            error='Max retries exceeded',
+            metadata=ResponseMetadata(
+                endpoint=endpoint,
+                timestamp=timestamp,
+                max_retries=max_retries
+            )
+        )
+    
+    async def _cached_fetch(self, full_endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch F1 data through the shared TTL response cache"""
+        try:
+            key = (full_endpoint, _freeze_params(params))
+            hash(key)
+        except TypeError:
+            return await self._fetch(full_endpoint, params)
+        
+        # Per-key lock so concurrent misses for the same request fetch only once
+        locks = self._cache_locks.setdefault(asyncio.get_running_loop(), {})
+        lock_entry = locks.get(key)
+        if lock_entry is None:
+            lock_entry = locks[key] = [asyncio.Lock(), 0]
+        lock_entry[1] += 1
+        try:
+            async with lock_entry[0]:
+                entry = self._cache.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self._cache[key] = self._cache.pop(key)  # Mark as most recently used
+                    return self._copy_response(entry[1])
+                
+                response = await self._fetch(full_endpoint, params)
+                if not (isinstance(response, dict) and response.get('success')
+                        and isinstance(response.get('data'), pd.DataFrame)):
+                    self._cache.pop(key, None)
+                    return response
+                
+                self._cache.pop(key, None)
+                self._cache[key] = (time.monotonic() + self._cache_ttl_for(params), response)
+                while len(self._cache) > self._cache_max_size:
+                    del self._cache[next(iter(self._cache))]
+                return self._copy_response(response)
+        finally:
+            # Drop the lock once no caller holds or waits on it, including on cancellation
+            lock_entry[1] -= 1
+            if not lock_entry[1]:
+                locks.pop(key, None)
+    
+    async def _fetch(self, full_endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch F1 data over the shared client, bounded by the fetch semaphore"""
+        client, sem = _get_http_state()
+        async with sem:
+            return await asyncio.wait_for(
+                fetch_f1_data(full_endpoint, params, client=client),
+                timeout=_FETCH_TIMEOUT
+            )
+    
+    def _cache_ttl_for(self, params: Dict[str, Any]) -> float:
+        """Past seasons are final and cached indefinitely; anything else uses the default TTL"""
+        try:
+            year = int(str(params.get('year', '')).strip())
+        except ValueError:
+            return self._cache_ttl
+        return float('inf') if year < datetime.now().year else self._cache_ttl
+    
+    @staticmethod
+    def _copy_response(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Deep-copy a cached response so callers can't modify the cached frame"""
+        return {**response, 'data': response['data'].copy(deep=True)}
     
     def _normalize_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize parameters handling both single values and lists"""
         if not params or not isinstance(params, dict):
             return {}
-            
-        normalized = {}
-        for key, value in params.items():
-            # Skip empty values
-            if value is None or value == "":
-                continue
-                
-            # Convert 'season' to 'year' if present
-            if key == 'season':
-                key = 'year'
-            
-            try:
-                if isinstance(value, str):
-                    # Handle driver names specially
-                    if key == 'driver':
-                        normalized[key] = value.lower().replace(' ', '_')
-                    else:
-                        normalized[key] = value.strip()
-                elif isinstance(value, list):
-                    # Handle list of values
-                    normalized_list = []
-                    for v in value:
-                        if isinstance(v, str):
-                            if key == 'driver':
-                                normalized_list.append(v.lower().replace(' ', '_'))
-                            else:
-                                normalized_list.append(v.strip())
-                        else:
-                            normalized_list.append(v)
-                    normalized[key] = normalized_list
-                else:
-                    normalized[key] = value
-            except Exception as e:
-                print(f"Error normalizing parameter {key}: {str(e)}")
-                continue
-                
-        return normalized
+        
+        # Skip empty values and convert 'season' to 'year'
+        return {
+            ('year' if key == 'season' else key): _norm_value(key, value)
+            for key, value in params.items()
+            if value is not None and value != ""
+        }
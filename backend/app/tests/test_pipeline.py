@@ -1,10 +1,13 @@
 """Tests for the pipeline components."""
+import asyncio
 import pytest
 import pandas as pd
 from datetime import datetime
 import time
 
+from app.pipeline import data2
 from app.pipeline.data2 import DataPipeline
+from app.query.models import DataRequirements
 from app.pipeline.optimized_adapters import OptimizedQueryAdapter, OptimizedResultAdapter
 
 @pytest.mark.asyncio
@@ -78,4 +81,221 @@ async def test_result_adapter(sample_pipeline_result):
     assert adapted.data is not None
     assert 'results' in adapted.data
     assert adapted.metadata['query_type'] == 'historical'
-    assert 'processing_time' in adapted.metadata 
\ No newline at end of file
+    assert 'processing_time' in adapted.metadata 
+
+class FakeF1API:
+    """Stand-in for fetch_f1_data that counts calls and serves canned responses"""
+    
+    def __init__(self, responses=None, delay=0.0):
+        self.calls = []
+        self.responses = list(responses or [])
+        self.delay = delay
+    
+    async def __call__(self, endpoint, params=None, client=None):
+        self.calls.append(endpoint)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.responses:
+            return self.responses.pop(0)
+        return {'success': True, 'data': pd.DataFrame({'points': [1.0, 2.0]})}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """Patch the pipeline's F1 fetch and start from an empty response cache"""
+    api = FakeF1API()
+    monkeypatch.setattr(data2, 'fetch_f1_data', api)
+    monkeypatch.setattr(DataPipeline, '_cache', {})
+    return api
+
+
+def driver_requirements(year):
+    return DataRequirements(endpoint='DRIVERS.year', params={'year': str(year)})
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_past_seasons_without_refetch(fake_api):
+    """Completed seasons never expire from the response cache"""
+    pipeline = DataPipeline()
+    first = await pipeline._process_single(driver_requirements(2015))
+    second = await pipeline._process_single(driver_requirements(2015))
+    
+    assert first.success and second.success
+    assert fake_api.calls == ['/2015/drivers']
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_current_season_after_ttl(fake_api, monkeypatch):
+    """Current-season entries are refetched once the TTL has passed"""
+    monkeypatch.setattr(DataPipeline, '_cache_ttl', 0.0)
+    pipeline = DataPipeline()
+    year = datetime.now().year
+    await pipeline._process_single(driver_requirements(year))
+    await pipeline._process_single(driver_requirements(year))
+    
+    assert fake_api.calls == [f'/{year}/drivers'] * 2
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(fake_api, monkeypatch):
+    """The oldest unused entry is evicted once the size cap is exceeded"""
+    monkeypatch.setattr(DataPipeline, '_cache_max_size', 2)
+    pipeline = DataPipeline()
+    for year in (2010, 2011, 2010, 2012):  # 2010 is refreshed, so 2011 is evicted
+        await pipeline._process_single(driver_requirements(year))
+    fake_api.calls.clear()
+    
+    await pipeline._process_single(driver_requirements(2010))
+    await pipeline._process_single(driver_requirements(2011))
+    assert fake_api.calls == ['/2011/drivers']
+
+
+@pytest.mark.asyncio
+async def test_cache_skips_failed_responses(fake_api):
+    """Failed fetches are not cached"""
+    fake_api.responses = [{'success': False, 'error': 'No data found for the given parameters'}] * 2
+    pipeline = DataPipeline()
+    await pipeline._cached_fetch('/2015/drivers', {'year': '2015'})
+    await pipeline._cached_fetch('/2015/drivers', {'year': '2015'})
+    
+    assert len(fake_api.calls) == 2
+    assert DataPipeline._cache == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_returns_independent_frames(fake_api):
+    """Editing a returned frame in place does not alter the cached copy"""
+    pipeline = DataPipeline()
+    first = await pipeline._process_single(driver_requirements(2015))
+    first.data['results'].loc[0, 'points'] = 99.0
+    second = await pipeline._process_single(driver_requirements(2015))
+    
+    assert second.data['results']['points'].tolist() == [1.0, 2.0]
+
+
+def test_cache_locks_work_across_event_loops(fake_api):
+    """Per-key locks are not tied to the first event loop that used them"""
+    fake_api.delay = 0.01
+    fake_api.responses = [{'success': False, 'error': 'unavailable'}] * 4
+    
+    async def fetch_twice():
+        pipeline = DataPipeline()
+        return await asyncio.gather(*(
+            pipeline._cached_fetch('/2015/drivers', {'year': '2015'}) for _ in range(2)
+        ))
+    
+    for _ in range(2):
+        results = asyncio.run(fetch_twice())
+        assert [r['error'] for r in results] == ['unavailable'] * 2
+
+
+def http_failure(status_code):
+    return {
+        'success': False,
+        'error': f'Request failed: HTTP {status_code}',
+        'metadata': {'status_code': status_code}
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_retried(fake_api, monkeypatch):
+    """A 4xx response fails after a single attempt"""
+    monkeypatch.setattr(data2, '_backoff_delay', lambda base, attempt: 0)
+    fake_api.responses = [http_failure(404)]
+    result = await DataPipeline()._process_single(driver_requirements(2015))
+    
+    assert not result.success
+    assert len(fake_api.calls) == 1
+    assert result.metadata.attempt == 1
+    assert result.metadata.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('status_code', [429, 500, 503])
+async def test_rate_limit_and_server_errors_are_retried(fake_api, monkeypatch, status_code):
+    """429 and 5xx responses are retried until a fetch succeeds"""
+    monkeypatch.setattr(data2, '_backoff_delay', lambda base, attempt: 0)
+    fake_api.responses = [http_failure(status_code)]
+    result = await DataPipeline()._process_single(driver_requirements(2015))
+    
+    assert result.success
+    assert len(fake_api.calls) == 2
+    assert result.metadata.attempt == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_fetch_once(fake_api):
+    """Concurrent misses for the same request share one fetch through the cache lock"""
+    fake_api.delay = 0.01
+    pipeline = DataPipeline()
+    results = await asyncio.gather(*(
+        pipeline._process_single(driver_requirements(2015)) for _ in range(3)
+    ))
+    
+    assert all(result.success for result in results)
+    assert fake_api.calls == ['/2015/drivers']
+
+
+def test_concat_with_key_mixed_dtypes():
+    """Mixed-dtype frames keep their dtypes and gain the key as the last column"""
+    frames = [
+        pd.DataFrame({'race_name': ['Monaco'], 'points': [25.0], 'position': [1]}),
+        pd.DataFrame({'race_name': ['Monza', 'Spa'], 'points': [18.0, 15.0], 'position': [2, 3]})
+    ]
+    merged = data2._concat_with_key(frames, [2020, 2021], 'year')
+    
+    assert list(merged.columns) == ['race_name', 'points', 'position', 'year']
+    assert merged['year'].tolist() == [2020, 2021, 2021]
+    assert merged['race_name'].tolist() == ['Monaco', 'Monza', 'Spa']
+    assert merged['position'].dtype.kind == 'i'
+    assert list(merged.index) == [0, 1, 2]
+
+
+def test_concat_with_key_uniform_dtypes():
+    """Single-dtype frames stack without dtype loss"""
+    frames = [pd.DataFrame({'points': [25.0, 18.0]}), pd.DataFrame({'points': [15.0]})]
+    merged = data2._concat_with_key(frames, ['hamilton', 'verstappen'], 'driver')
+    
+    assert list(merged.columns) == ['points', 'driver']
+    assert merged['points'].dtype == 'float64'
+    assert merged['driver'].tolist() == ['hamilton', 'hamilton', 'verstappen']
+
+
+def test_concat_with_key_single_frame():
+    """A single frame is annotated and reindexed without a concat"""
+    frame = pd.DataFrame({'points': [25.0, 18.0]}, index=[5, 9])
+    merged = data2._concat_with_key([frame], [2023], 'year')
+    
+    assert list(merged.columns) == ['points', 'year']
+    assert merged['year'].tolist() == [2023, 2023]
+    assert list(merged.index) == [0, 1]
+    assert 'year' not in frame.columns
+
+
+def test_concat_with_key_replaces_existing_column():
+    """An existing column named like the key is overwritten in place"""
+    frames = [
+        pd.DataFrame({'driver': ['Lewis Hamilton'], 'points': [25.0]}),
+        pd.DataFrame({'driver': ['Max Verstappen'], 'points': [18.0]})
+    ]
+    merged = data2._concat_with_key(frames, ['hamilton', 'max_verstappen'], 'driver')
+    
+    assert list(merged.columns) == ['driver', 'points']
+    assert merged['driver'].tolist() == ['hamilton', 'max_verstappen']
+
+
+def test_concat_with_key_no_frames():
+    assert data2._concat_with_key([], [], 'year').empty
+
+
+@pytest.mark.asyncio
+async def test_aclose_http_clients_closes_pooled_clients():
+    """Shutdown closes the shared client and a later fetch gets a fresh one"""
+    client, _ = data2._get_http_state()
+    await data2.aclose_http_clients()
+    
+    assert client.is_closed
+    assert len(data2._http_state) == 0
+    new_client, _ = data2._get_http_state()
+    assert new_client is not client
+    await data2.aclose_http_clients()